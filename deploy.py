@@ -6,17 +6,23 @@ import os
 import sys
 import subprocess
 import json
+import time
+import asyncio
+from functools import lru_cache
+
+
+ECR_TOKEN_CACHE = os.path.join(
+    os.path.expanduser("~"), ".cache", "mental-health-deploy", "ecr-token.json"
+)
+ECR_TOKEN_TTL = 12 * 60 * 60  # ECR login tokens are valid for 12 hours
+ECR_TOKEN_REFRESH_MARGIN = 60 * 60  # refresh an hour before they expire
 
 
 def check_aws_cli():
     """Check if AWS CLI is installed and configured"""
     try:
-        result = subprocess.run(
-            ["aws", "sts", "get-caller-identity"],
-            capture_output=True, check=True
-        )
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
+        return bool(get_aws_account_id())
+    except FileNotFoundError:
         return False
 
 
@@ -59,7 +65,97 @@ def run_local_docker(tag="mental-health-api:latest", port=9696):
         print("\n\nContainer stopped")
 
 
-def deploy_to_aws_ecr(region="us-east-1", repo_name="mental-health-api"):
+async def run_command(cmd, capture_output=True, input=None):
+    """Run a command without blocking the event loop, return (returncode, stdout, stderr)"""
+    pipe = asyncio.subprocess.PIPE if capture_output else None
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE if input is not None else None,
+        stdout=pipe, stderr=pipe
+    )
+    stdout, stderr = await proc.communicate(input.encode() if input is not None else None)
+    return proc.returncode, (stdout or b"").decode(), (stderr or b"").decode()
+
+
+async def push_docker_images(uris):
+    """Push several image URIs concurrently, return list of return codes"""
+    results = await asyncio.gather(*(
+        run_command(["docker", "push", uri], capture_output=False)
+        for uri in uris
+    ))
+    return [returncode for returncode, _, _ in results]
+
+
+async def create_ecr_repository(repo_name, region="us-east-1"):
+    """Create ECR repository (no-op if it already exists)"""
+    await run_command([
+        "aws", "ecr", "create-repository",
+        "--repository-name", repo_name,
+        "--region", region
+    ])
+
+
+async def create_log_group(region="us-east-1"):
+    """Create CloudWatch log group for the ECS task (no-op if it already exists)"""
+    await run_command([
+        "aws", "logs", "create-log-group",
+        "--log-group-name", "/ecs/mental-health-api",
+        "--region", region
+    ])
+
+
+def load_ecr_token_cache():
+    """Read cached ECR login tokens, keyed by account and region"""
+    try:
+        with open(ECR_TOKEN_CACHE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_ecr_token_cache(cache):
+    """Write ECR login tokens to the cache file, readable by the owner only"""
+    os.makedirs(os.path.dirname(ECR_TOKEN_CACHE), exist_ok=True)
+    fd = os.open(ECR_TOKEN_CACHE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump(cache, f)
+
+
+async def get_ecr_password(account_id, region="us-east-1"):
+    """Get ECR login password, reusing a cached token until it is close to expiry"""
+    cache = load_ecr_token_cache()
+    key = f"{account_id}:{region}"
+    entry = cache.get(key)
+    
+    if entry and time.time() + ECR_TOKEN_REFRESH_MARGIN < entry["expires_at"]:
+        return entry["token"]
+    
+    fetched_at = time.time()
+    returncode, stdout, _ = await run_command([
+        "aws", "ecr", "get-login-password",
+        "--region", region
+    ])
+    
+    if returncode != 0:
+        return None
+    
+    token = stdout.strip()
+    cache[key] = {"token": token, "expires_at": fetched_at + ECR_TOKEN_TTL}
+    save_ecr_token_cache(cache)
+    return token
+
+
+async def is_cluster_active(cluster_name, region="us-east-1"):
+    """Check whether the ECS cluster exists and is active"""
+    _, stdout, _ = await run_command([
+        "aws", "ecs", "describe-clusters",
+        "--clusters", cluster_name,
+        "--region", region
+    ])
+    return "ACTIVE" in stdout
+
+
+async def deploy_to_aws_ecr(region="us-east-1", repo_name="mental-health-api", tags=("latest",)):
     """
     Deploy to AWS Elastic Container Registry (ECR)
     Prerequisites:
@@ -70,59 +166,52 @@ def deploy_to_aws_ecr(region="us-east-1", repo_name="mental-health-api"):
     print("=" * 60)
     
     # Get AWS account ID
-    result = subprocess.run(
-        ["aws", "sts", "get-caller-identity", "--query", "Account", "--output", "text"],
-        capture_output=True, text=True
-    )
+    account_id = get_aws_account_id()
     
-    if result.returncode != 0:
+    if not account_id:
         print("✗ AWS CLI not configured. Run: aws configure")
         return False
     
-    account_id = result.stdout.strip()
-    ecr_uri = f"{account_id}.dkr.ecr.{region}.amazonaws.com/{repo_name}"
+    ecr_repo = f"{account_id}.dkr.ecr.{region}.amazonaws.com/{repo_name}"
+    image_uris = [f"{ecr_repo}:{tag}" for tag in tags]
+    ecr_uri = image_uris[0]
     
     print(f"AWS Account ID: {account_id}")
-    print(f"ECR Repository: {ecr_uri}")
+    print(f"ECR Repository: {ecr_repo}")
     print()
     
-    # Step 1: Create ECR repository (if doesn't exist)
+    # Steps 1-2 are independent AWS API calls, so run them concurrently
     print("Step 1: Creating ECR repository...")
-    subprocess.run([
-        "aws", "ecr", "create-repository",
-        "--repository-name", repo_name,
-        "--region", region
-    ], capture_output=True)
-    
-    # Step 2: Authenticate Docker to ECR
     print("Step 2: Authenticating Docker to ECR...")
-    result = subprocess.run([
-        "aws", "ecr", "get-login-password",
-        "--region", region
-    ], capture_output=True, text=True)
+    _, password = await asyncio.gather(
+        create_ecr_repository(repo_name, region),
+        get_ecr_password(account_id, region)
+    )
     
-    if result.returncode != 0:
+    if not password:
         print("✗ Failed to get ECR login password")
         return False
     
-    password = result.stdout.strip()
-    subprocess.run([
+    await run_command([
         "docker", "login",
         "--username", "AWS",
         "--password-stdin",
         f"{account_id}.dkr.ecr.{region}.amazonaws.com"
-    ], input=password, text=True)
+    ], capture_output=False, input=password)
     
     # Step 3: Build image
     print("Step 3: Building Docker image...")
-    if not build_docker_image(tag=ecr_uri):
+    if not await asyncio.to_thread(build_docker_image, tag=ecr_uri):
         return False
     
-    # Step 4: Push to ECR
+    for uri in image_uris[1:]:
+        await run_command(["docker", "tag", ecr_uri, uri])
+    
+    # Step 4: Push to ECR (all tags in parallel)
     print("Step 4: Pushing image to ECR...")
-    result = subprocess.run(["docker", "push", ecr_uri])
+    return_codes = await push_docker_images(image_uris)
     
-    if result.returncode == 0:
+    if all(code == 0 for code in return_codes):
         print(f"\n✓ Successfully pushed to ECR: {ecr_uri}")
         print("\n" + "=" * 60)
         print("Next steps to deploy to ECS:")
@@ -140,7 +229,7 @@ def deploy_to_aws_ecr(region="us-east-1", repo_name="mental-health-api"):
         return None
 
 
-def create_ecs_task_definition(ecr_uri, region="us-east-1"):
+async def create_ecs_task_definition(ecr_uri, region="us-east-1", log_group_ready=False):
     """Create ECS task definition"""
     print("\nCreating ECS Task Definition")
     print("=" * 60)
@@ -175,13 +264,10 @@ def create_ecs_task_definition(ecr_uri, region="us-east-1"):
         ]
     }
     
-    # Create CloudWatch log group
-    print("Creating CloudWatch log group...")
-    subprocess.run([
-        "aws", "logs", "create-log-group",
-        "--log-group-name", "/ecs/mental-health-api",
-        "--region", region
-    ], capture_output=True)
+    # Create CloudWatch log group (unless the caller already did)
+    if not log_group_ready:
+        print("Creating CloudWatch log group...")
+        await create_log_group(region)
     
     # Save to file
     task_def_file = "ecs-task-definition.json"
@@ -192,22 +278,22 @@ def create_ecs_task_definition(ecr_uri, region="us-east-1"):
     
     # Register task definition
     print("Registering task definition...")
-    result = subprocess.run([
+    returncode, _, stderr = await run_command([
         "aws", "ecs", "register-task-definition",
         "--cli-input-json", f"file://{task_def_file}",
         "--region", region
-    ], capture_output=True, text=True)
+    ])
     
-    if result.returncode == 0:
+    if returncode == 0:
         print("✓ Task definition created successfully")
         print("\nNext: Create ECS service (option 5)")
         return True
     else:
-        print(f"✗ Failed to create task definition: {result.stderr}")
+        print(f"✗ Failed to create task definition: {stderr}")
         return False
 
 
-def create_ecs_service(region="us-east-1"):
+async def create_ecs_service(region="us-east-1", cluster_active=None):
     """Create ECS service with Application Load Balancer"""
     print("\nCreating ECS Service")
     print("=" * 60)
@@ -215,20 +301,17 @@ def create_ecs_service(region="us-east-1"):
     cluster_name = "mental-health-cluster"
     service_name = "mental-health-service"
     
-    # Check if cluster exists
-    result = subprocess.run([
-        "aws", "ecs", "describe-clusters",
-        "--clusters", cluster_name,
-        "--region", region
-    ], capture_output=True, text=True)
+    # Check if cluster exists (unless the caller already did)
+    if cluster_active is None:
+        cluster_active = await is_cluster_active(cluster_name, region)
     
-    if "ACTIVE" not in result.stdout:
+    if not cluster_active:
         print(f"Creating ECS cluster: {cluster_name}")
-        subprocess.run([
+        await run_command([
             "aws", "ecs", "create-cluster",
             "--cluster-name", cluster_name,
             "--region", region
-        ])
+        ], capture_output=False)
     
     print(f"\n⚠️  Manual steps required:")
     print(f"\n1. Get your VPC ID and Subnets:")
@@ -262,8 +345,9 @@ def create_ecs_service(region="us-east-1"):
     return True
 
 
+@lru_cache(maxsize=1)
 def get_aws_account_id():
-    """Get AWS account ID"""
+    """Get AWS account ID (cached, STS is only queried once per process)"""
     result = subprocess.run([
         "aws", "sts", "get-caller-identity",
         "--query", "Account",
@@ -272,26 +356,30 @@ def get_aws_account_id():
     return result.stdout.strip() if result.returncode == 0 else ""
 
 
-def deploy_full_stack(region="us-east-1"):
+async def deploy_full_stack(region="us-east-1"):
     """Full deployment workflow"""
     print("\n" + "=" * 60)
     print("Full AWS Deployment Workflow")
     print("=" * 60)
     
-    # Step 1: Deploy to ECR
+    # Step 1: Deploy to ECR, while independent prep calls run alongside
     print("\nStep 1: Deploying to AWS ECR...")
-    ecr_uri = deploy_to_aws_ecr(region=region, repo_name="mental-health-api")
+    ecr_uri, _, cluster_active = await asyncio.gather(
+        deploy_to_aws_ecr(region=region, repo_name="mental-health-api"),
+        create_log_group(region),
+        is_cluster_active("mental-health-cluster", region)
+    )
     if not ecr_uri:
         return False
     
     # Step 2: Create task definition
     print("\nStep 2: Creating ECS Task Definition...")
-    if not create_ecs_task_definition(ecr_uri, region):
+    if not await create_ecs_task_definition(ecr_uri, region, log_group_ready=True):
         return False
     
     # Step 3: Instructions for service
     print("\nStep 3: ECS Service Setup...")
-    create_ecs_service(region)
+    await create_ecs_service(region, cluster_active=cluster_active)
     
     return True
 
@@ -350,15 +438,15 @@ def main():
         elif choice == "2":
             run_local_docker()
         elif choice == "3":
-            deploy_to_aws_ecr(region=region)
+            asyncio.run(deploy_to_aws_ecr(region=region))
         elif choice == "4":
             ecr_uri = input("Enter ECR image URI: ").strip()
             if ecr_uri:
-                create_ecs_task_definition(ecr_uri, region)
+                asyncio.run(create_ecs_task_definition(ecr_uri, region))
         elif choice == "5":
-            create_ecs_service(region)
+            asyncio.run(create_ecs_service(region))
         elif choice == "6":
-            deploy_full_stack(region)
+            asyncio.run(deploy_full_stack(region))
         else:
             print("Invalid option. Please try again.")
 
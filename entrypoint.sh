@@ -0,0 +1,8 @@
+#!/bin/sh
+set -e
+
+# Fail fast on a bad model.bin instead of crash-looping every gunicorn worker
+python warmup.py
+
+# --preload loads the model once in the master, workers share it copy-on-write
+exec gunicorn --workers 4 --threads 2 --preload --bind 0.0.0.0:9696 serve:app
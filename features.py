@@ -0,0 +1,70 @@
+"""
+Feature encoding shared by training and serving.
+"""
+from typing import Dict, List, Tuple
+
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import OneHotEncoder
+
+
+def build_preprocessor(df: pd.DataFrame) -> ColumnTransformer:
+    """
+    One-hot encode string columns and pass numeric columns through.
+    """
+    categorical_cols = df.select_dtypes(exclude="number").columns.tolist()
+    numeric_cols = [c for c in df.columns if c not in categorical_cols]
+
+    return ColumnTransformer(
+        [
+            (
+                "cat",
+                OneHotEncoder(handle_unknown="ignore", sparse_output=True),
+                categorical_cols,
+            ),
+            ("num", "passthrough", numeric_cols),
+        ],
+        sparse_threshold=1.0,  # always return a sparse matrix
+    )
+
+
+def split_columns(preprocessor: ColumnTransformer) -> Tuple[List[str], List[str]]:
+    """
+    Categorical and numeric input columns of a fitted preprocessor.
+    """
+    columns = {name: cols for name, _, cols in preprocessor.transformers_}
+    return list(columns["cat"]), list(columns["num"])
+
+
+def feature_names(preprocessor: ColumnTransformer) -> List[str]:
+    """
+    Names of the encoded features, in output order:
+    "col=value" for one-hot features, "col" for numeric ones.
+    """
+    categorical_cols, numeric_cols = split_columns(preprocessor)
+    encoder = preprocessor.named_transformers_["cat"]
+
+    names = [
+        f"{col}={category}"
+        for col, categories in zip(categorical_cols, encoder.categories_)
+        for category in categories
+    ]
+    return names + numeric_cols
+
+
+def records_to_frame(records: List[Dict], preprocessor: ColumnTransformer) -> pd.DataFrame:
+    """
+    Build a frame the fitted preprocessor accepts from raw feature dicts.
+
+    Missing columns and values of the wrong type contribute nothing to the
+    prediction: numeric ones become 0, categorical ones an unseen category.
+    """
+    categorical_cols, numeric_cols = split_columns(preprocessor)
+
+    df = pd.DataFrame(records).reindex(
+        columns=preprocessor.feature_names_in_
+    )
+    df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors="coerce").fillna(0)
+    df[categorical_cols] = df[categorical_cols].fillna("").astype(str)
+
+    return df
@@ -1,22 +1,28 @@
-import pickle
+import joblib
 import numpy as np
+from scipy.special import expit
+from functools import lru_cache
 from typing import Dict
 
+from features import records_to_frame
+
 
 MODEL_PATH = "model.bin"
 
 
+@lru_cache(maxsize=1)
 def load_artifacts():
     """
-    Load trained model and DictVectorizer from disk.
+    Load trained model and feature preprocessor from disk.
+
+    The result is cached, so the pickle is read only once per process.
     """
-    with open(MODEL_PATH, "rb") as f:
-        artifact = pickle.load(f)
+    artifact = joblib.load(MODEL_PATH, mmap_mode="r")
 
     model = artifact["model"]
-    dv = artifact["dict_vectorizer"]
+    preprocessor = artifact["preprocessor"]
 
-    return model, dv
+    return model, preprocessor
 
 
 def predict(features: Dict) -> Dict:
@@ -27,10 +33,13 @@ def predict(features: Dict) -> Dict:
         - probability of mental health issue
         - predicted class (0 / 1)
     """
-    model, dv = load_artifacts()
+    model, preprocessor = load_artifacts()
 
-    X = dv.transform([features])
-    prob = model.predict_proba(X)[0, 1]
+    X = preprocessor.transform(records_to_frame([features], preprocessor))
+    # Binary LR: P(class 1) = sigmoid(X @ w + b), same as predict_proba(X)[0, 1]
+    w = model.coef_.astype(np.float32).ravel()
+    b = np.float32(model.intercept_[0])
+    prob = expit(X.astype(np.float32) @ w + b)[0]
     pred = int(prob >= 0.5)
 
     return {
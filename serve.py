@@ -1,21 +1,110 @@
-from flask import Flask, request, jsonify
-import pickle
+import hmac
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import Flask, Response, request
+import joblib
 import numpy as np
+import orjson
+from scipy.special import expit
+
+from features import feature_names, records_to_frame
 
 
 MODEL_PATH = "model.bin"
+RELOAD_TOKEN = os.getenv("RELOAD_TOKEN")  # /reload is disabled unless set
 
 app = Flask("mental-health-predictor")
 
 
 # =========================
-# Load model (lazy loading)
+# Load model (once, at startup)
 # =========================
 def load_artifact():
-    with open(MODEL_PATH, "rb") as f:
-        artifact = pickle.load(f)
+    artifact = joblib.load(MODEL_PATH, mmap_mode="r")
+
+    return artifact["model"], artifact["preprocessor"]
+
+
+def build_scorer(model, preprocessor):
+    """
+    Everything the prediction routes need, derived once from the artifact.
+
+    Kept in one dict so /reload can swap it with a single assignment and a
+    request never mixes weights of two different models.
+    """
+    # Binary LR: P(class 1) = sigmoid(X @ w + b), so skip predict_proba's
+    # two-column output and compute the positive-class column directly.
+    # float32 is plenty for serving and halves the bytes the dot product reads.
+    w = model.coef_.astype(np.float32).ravel()
+    b = np.float32(model.intercept_[0])
+
+    return {
+        "preprocessor": preprocessor,
+        "w": w,
+        "b": b,
+        # Feature name -> weight, to score a single record without transform()
+        "weights": {
+            name: float(w[i]) for i, name in enumerate(feature_names(preprocessor))
+        },
+    }
+
+
+SCORER = build_scorer(*load_artifact())
+RELOAD_LOCK = threading.Lock()
+
+
+def read_json():
+    """
+    Parse the request body with orjson; returns None for malformed JSON.
+    """
+    try:
+        return orjson.loads(request.get_data())
+    except orjson.JSONDecodeError:
+        return None
+
+
+def json_response(payload, status=200):
+    return Response(orjson.dumps(payload), status=status, mimetype="application/json")
+
+
+def format_prediction(prob):
+    return {"probability": round(float(prob), 4), "prediction": int(prob >= 0.5)}
+
+
+def score_record(record, scorer):
+    """
+    Linear score (X @ w + b) of a single feature dict.
+
+    Encodes features the same way the preprocessor does: strings become
+    one-hot "key=value" features, numbers are used as-is and unknown
+    features contribute nothing. Returns None for any other value type,
+    so the caller can fall back to predict_records.
+    """
+    weights = scorer["weights"]
+    z = float(scorer["b"])
+    for key, value in record.items():
+        if isinstance(value, str):
+            z += weights.get(f"{key}={value}", 0.0)
+        elif isinstance(value, (int, float)):
+            z += weights.get(key, 0.0) * value
+        else:
+            return None
 
-    return artifact["model"], artifact["dict_vectorizer"]
+    return z
+
+
+def predict_records(records, scorer):
+    """
+    Score a list of feature dicts with a single transform / dot product.
+    """
+    preprocessor = scorer["preprocessor"]
+    X = preprocessor.transform(records_to_frame(records, preprocessor))
+    probs = expit(X.astype(np.float32) @ scorer["w"] + scorer["b"])
+
+    return [format_prediction(p) for p in probs]
 
 
 # =========================
@@ -36,35 +125,81 @@ def health():
 
 @app.route("/predict", methods=["POST"])
 def predict():
-    data = request.get_json()
+    data = read_json()
 
     if not data:
-        return jsonify({"error": "No input data provided"}), 400
+        return json_response({"error": "No input data provided"}, 400)
 
-    # Lazy-load model
-    if not hasattr(predict, "model"):
-        predict.model, predict.dv = load_artifact()
+    scorer = SCORER
 
     try:
-        X = predict.dv.transform([data])
-        prob = predict.model.predict_proba(X)[0, 1]
-        pred = int(prob >= 0.5)
+        z = score_record(data, scorer)
+        if z is None:
+            result = predict_records([data], scorer)[0]
+        else:
+            result = format_prediction(expit(z))
+
+        return json_response(result)
+
+    except Exception as e:
+        return json_response({"error": str(e)}, 500)
+
 
-        result = {
-            "probability": round(float(prob), 4),
-            "prediction": pred,
-        }
+@app.route("/predict_batch", methods=["POST"])
+def predict_batch():
+    data = read_json()
+    records = data.get("records") if isinstance(data, dict) else None
 
-        return jsonify(result)
+    if not records or not isinstance(records, list):
+        return json_response({"error": "Expected a non-empty 'records' list"}, 400)
+
+    try:
+        return json_response({"predictions": predict_records(records, SCORER)})
 
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return json_response({"error": str(e)}, 500)
+
+
+@app.route("/reload", methods=["POST"])
+def reload_model():
+    """
+    Reload model.bin without restarting the service.
+
+    The artifact is unpickled in a separate process, so a missing or corrupt
+    file cannot crash this worker, and the running model is only replaced
+    once the new one has scored a record. Under gunicorn each worker holds
+    its own model, so this reloads the worker that handled the request.
+    """
+    global SCORER
+
+    if not RELOAD_TOKEN:
+        return json_response({"error": "Reload is disabled"}, 404)
+
+    token = request.headers.get("X-Reload-Token", "")
+    if not hmac.compare_digest(token.encode(), RELOAD_TOKEN.encode()):
+        return json_response({"error": "Invalid reload token"}, 403)
+
+    with RELOAD_LOCK:
+        try:
+            # spawn, not fork: forking a threaded worker can deadlock the child
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                artifact = pool.submit(joblib.load, MODEL_PATH).result()
+
+            scorer = build_scorer(artifact["model"], artifact["preprocessor"])
+            predict_records([{}], scorer)
+
+        except Exception as e:
+            return json_response({"error": f"Reload failed, keeping current model: {e}"}, 500)
+
+        SCORER = scorer
+
+    return json_response({"status": "OK"})
 
 
 # =========================
-# Run server
+# Run server (local debugging only, the container runs gunicorn)
 # =========================
 if __name__ == "__main__":
-    import os
     port = int(os.getenv("PORT", 9696))
     app.run(host="0.0.0.0", port=port, debug=False)
@@ -4,11 +4,17 @@ Demonstrates how to interact with the deployed service
 """
 import requests
 import json
+import time
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 
 
 # Configuration
 API_URL = "http://localhost:9696"  # Change this for cloud deployment
 
+# Reuse one keep-alive connection pool instead of reconnecting per request
+SESSION = requests.Session()
+
 
 def test_health_check():
     """Test the health endpoint"""
@@ -16,7 +22,7 @@ def test_health_check():
     print("Testing Health Check Endpoint")
     print("=" * 60)
     
-    response = requests.get(f"{API_URL}/health")
+    response = SESSION.get(f"{API_URL}/health")
     print(f"Status Code: {response.status_code}")
     print(f"Response: {response.json()}")
     print()
@@ -32,10 +38,10 @@ def test_prediction(example_data):
     print(json.dumps(example_data, indent=2))
     print()
     
-    response = requests.post(
+    response = SESSION.post(
         f"{API_URL}/predict",
         headers={"Content-Type": "application/json"},
-        json=example_data
+        data=orjson.dumps(example_data)
     )
     
     print(f"Status Code: {response.status_code}")
@@ -54,6 +60,32 @@ def test_prediction(example_data):
     return response
 
 
+def test_load(example_data, n_requests=100, workers=8):
+    """Send many prediction requests concurrently and report throughput"""
+    print("=" * 60)
+    print(f"Load Test: {n_requests} requests, {workers} threads")
+    print("=" * 60)
+    
+    body = orjson.dumps(example_data)
+    
+    def send(_):
+        return SESSION.post(
+            f"{API_URL}/predict",
+            headers={"Content-Type": "application/json"},
+            data=body
+        ).status_code
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        status_codes = list(executor.map(send, range(n_requests)))
+    elapsed = time.perf_counter() - start
+    
+    ok = sum(code == 200 for code in status_codes)
+    print(f"Successful: {ok}/{n_requests}")
+    print(f"Elapsed: {elapsed:.2f}s ({n_requests / elapsed:.1f} req/s)")
+    print()
+
+
 def main():
     """Run all tests"""
     
@@ -150,6 +182,13 @@ def main():
     
     test_prediction(low_risk_data)
     
+    # Test 4: Concurrent requests
+    print("\n" + "=" * 60)
+    print("TEST 3: Load Test")
+    print("=" * 60)
+    
+    test_load(low_risk_data)
+    
     print("\n" + "=" * 60)
     print("All tests completed!")
     print("=" * 60)
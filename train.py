@@ -1,12 +1,16 @@
 import os
-import pickle
 from typing import Tuple
 
+# Parallelism comes from the CV search workers; keep BLAS single-threaded so
+# the workers don't oversubscribe the CPU. Must be set before numpy is imported.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+
+import joblib
 import numpy as np
 import pandas as pd
 
 from sklearn.model_selection import train_test_split, RandomizedSearchCV
-from sklearn.feature_extraction import DictVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import (
     accuracy_score,
@@ -15,7 +19,7 @@ from sklearn.metrics import (
     f1_score,
     roc_auc_score,
 )
-from scipy.sparse import vstack
+from features import build_preprocessor
 
 
 # =========================
@@ -26,23 +30,80 @@ MODEL_PATH = os.getenv("MODEL_PATH", "model.bin")
 RANDOM_STATE = 42
 TARGET_COL = "Has_Mental_Health_Issue"
 
+# Column schema of the CSV, so the parser does not have to infer types
+DTYPES = {
+    "Age": "int64",
+    "Gender": "category",
+    "Country": "category",
+    "Education": "category",
+    "Marital_Status": "category",
+    "Income_Level": "category",
+    "Employment_Status": "category",
+    "Work_Hours_Per_Week": "int64",
+    "Remote_Work": "category",
+    "Job_Satisfaction": "int64",
+    "Work_Stress_Level": "int64",
+    "Work_Life_Balance": "int64",
+    "Ever_Bullied_At_Work": "int64",
+    "Company_Mental_Health_Support": "category",
+    "Exercise_Per_Week": "category",
+    "Sleep_Hours_Night": "float64",
+    "Caffeine_Drinks_Day": "int64",
+    "Alcohol_Frequency": "category",
+    "Smoking": "category",
+    "Screen_Time_Hours_Day": "float64",
+    "Social_Media_Hours_Day": "float64",
+    "Hobby_Time_Hours_Week": "int64",
+    "Diet_Quality": "category",
+    "Financial_Stress": "int64",
+    "Feeling_Sad_Down": "int64",
+    "Loss_Of_Interest": "int64",
+    "Sleep_Trouble": "int64",
+    "Fatigue": "int64",
+    "Poor_Appetite_Or_Overeating": "int64",
+    "Feeling_Worthless": "int64",
+    "Concentration_Difficulty": "int64",
+    "Anxious_Nervous": "int64",
+    "Panic_Attacks": "int64",
+    "Mood_Swings": "int64",
+    "Irritability": "int64",
+    "Obsessive_Thoughts": "int64",
+    "Compulsive_Behavior": "int64",
+    "Self_Harm_Thoughts": "int64",
+    "Suicidal_Thoughts": "int64",
+    "Family_History_Mental_Illness": "int64",
+    "Previously_Diagnosed": "int64",
+    "Ever_Sought_Treatment": "int64",
+    "On_Therapy_Now": "int64",
+    "On_Medication": "int64",
+    "Trauma_History": "int64",
+    "Social_Support": "int64",
+    "Close_Friends_Count": "int64",
+    "Feel_Understood": "int64",
+    "Loneliness": "int64",
+    "Discuss_Mental_Health": "category",
+    "Has_Mental_Health_Issue": "int64",
+}
+
 
 # =========================
 # Utilities
 # =========================
 def load_data(path: str) -> pd.DataFrame:
     print(f"[INFO] Loading data from {path}")
-    df = pd.read_csv(path)
+    df = pd.read_csv(path, engine="pyarrow", dtype=DTYPES)
 
     if TARGET_COL not in df.columns:
         raise ValueError(f"Target column '{TARGET_COL}' not found")
 
-    df[TARGET_COL] = df[TARGET_COL].astype(int)
+    df[TARGET_COL] = df[TARGET_COL].astype("int8")
     print(f"[INFO] Dataset shape: {df.shape}")
     return df
 
 
-def split_data(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+def split_data(
+    df: pd.DataFrame,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     df_full_train, df_test = train_test_split(
         df,
         test_size=0.2,
@@ -57,7 +118,7 @@ def split_data(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFra
         stratify=df_full_train[TARGET_COL],
     )
 
-    return df_train, df_val, df_test
+    return df_full_train, df_train, df_val, df_test
 
 
 def prepare_features(df_train, df_val, df_test):
@@ -69,18 +130,19 @@ def prepare_features(df_train, df_val, df_test):
     df_val = df_val.drop(columns=[TARGET_COL]).fillna(0)
     df_test = df_test.drop(columns=[TARGET_COL]).fillna(0)
 
-    dv = DictVectorizer(sparse=True)
+    preprocessor = build_preprocessor(df_train)
 
-    X_train = dv.fit_transform(df_train.to_dict(orient="records"))
-    X_val = dv.transform(df_val.to_dict(orient="records"))
-    X_test = dv.transform(df_test.to_dict(orient="records"))
+    X_train = preprocessor.fit_transform(df_train)
+    X_val = preprocessor.transform(df_val)
+    X_test = preprocessor.transform(df_test)
 
-    return X_train, X_val, X_test, y_train, y_val, y_test, dv
+    return X_train, X_val, X_test, y_train, y_val, y_test, preprocessor
 
 
 def evaluate(model, X, y_true) -> dict:
-    y_pred = model.predict(X)
+    # One decision-function pass; threshold matches predict.py / serve.py
     y_proba = model.predict_proba(X)[:, 1]
+    y_pred = (y_proba >= 0.5).astype(np.int8)
 
     return {
         "Accuracy": accuracy_score(y_true, y_pred),
@@ -99,9 +161,9 @@ def main() -> None:
 
     # Load & split
     df = load_data(DATA_PATH)
-    df_train, df_val, df_test = split_data(df)
+    df_full_train, df_train, df_val, df_test = split_data(df)
 
-    X_train, X_val, X_test, y_train, y_val, y_test, dv = prepare_features(
+    X_train, X_val, X_test, y_train, y_val, y_test, preprocessor = prepare_features(
         df_train, df_val, df_test
     )
 
@@ -121,7 +183,6 @@ def main() -> None:
     lr_base = LogisticRegression(
         solver="lbfgs",
         max_iter=1000,
-        n_jobs=-1,
         random_state=RANDOM_STATE,
     )
 
@@ -136,7 +197,8 @@ def main() -> None:
         verbose=1,
     )
 
-    lr_search.fit(X_train, y_train)
+    with joblib.parallel_backend("loky", n_jobs=-1):
+        lr_search.fit(X_train, y_train)
     best_lr = lr_search.best_estimator_
 
     val_metrics = evaluate(best_lr, X_val, y_val)
@@ -148,10 +210,13 @@ def main() -> None:
     # =========================
     print("\n[INFO] Final retrain on train + validation")
 
-    X_train_full = vstack([X_train, X_val])
-    y_train_full = np.concatenate([y_train, y_val])
+    # Re-encode train + val straight from the frame instead of stacking
+    # X_train / X_val, and drop those first so they don't add to peak memory
+    del X_train, X_val
+    X_full = preprocessor.transform(df_full_train.drop(columns=[TARGET_COL]).fillna(0))
+    y_full = df_full_train[TARGET_COL].values
 
-    best_lr.fit(X_train_full, y_train_full)
+    best_lr.fit(X_full, y_full)
 
     test_metrics = evaluate(best_lr, X_test, y_test)
     print("[FINAL TEST METRICS]", test_metrics)
@@ -161,15 +226,15 @@ def main() -> None:
     # =========================
     artifact = {
         "model": best_lr,
-        "dict_vectorizer": dv,
+        "preprocessor": preprocessor,
         "best_params": lr_search.best_params_,
         "validation_metrics": val_metrics,
         "test_metrics": test_metrics,
         "random_state": RANDOM_STATE,
     }
 
-    with open(MODEL_PATH, "wb") as f:
-        pickle.dump(artifact, f)
+    # Stored uncompressed so serving can memory-map the arrays (mmap_mode="r")
+    joblib.dump(artifact, MODEL_PATH)
 
     print(f"[INFO] Model saved to {MODEL_PATH}")
 
@@ -0,0 +1,32 @@
+"""
+Check that model.bin loads and can score a record before the API starts.
+Exits with a non-zero status if the artifact is missing, corrupt or
+incompatible with the installed libraries.
+"""
+import sys
+
+from predict import MODEL_PATH, predict
+
+
+EXAMPLE = {
+    "Age": 30,
+    "Gender": "Female",
+    "Country": "USA",
+    "Work_Stress_Level": 5,
+    "Sleep_Hours_Night": 7.0,
+}
+
+
+def main() -> int:
+    try:
+        result = predict(EXAMPLE)
+    except Exception as e:
+        print(f"[ERROR] Model warm-up failed for {MODEL_PATH}: {e}")
+        return 1
+
+    print(f"[INFO] Model warm-up OK: {result}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())